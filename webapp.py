@@ -1,16 +1,54 @@
 from flask import Flask, request, jsonify, send_file, after_this_request
+from flask.json.provider import JSONProvider
 from werkzeug.utils import secure_filename
+import gzip
 import os
 import traceback
-import zipfile
 import tempfile
-from utils import get_python_files, clone_github_repo, cleanup_temp_dir, generate_summary_github, generate_summary
+from uuid import uuid4
+from utils import get_python_files, clone_github_repo, cleanup_temp_dir, generate_summary_github, generate_summary, extract_zip
 from analyzer import analyze_files
 from graph import create_dependency_graph, save_graph
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = tempfile.gettempdir()
 
+if orjson is not None:
+    # Serialize the (potentially large) summary payloads with orjson,
+    # which emits bytes directly and is several times faster than stdlib
+    # json. Falls back to Flask's default provider when not installed.
+    class OrjsonProvider(JSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode('utf-8')
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = OrjsonProvider(app)
+
+_COMPRESS_MIN_SIZE = 1024  # bytes; tiny payloads aren't worth the CPU
+
+@app.after_request
+def compress_response(response):
+    # JSON summaries have highly repetitive keys and compress 5-10x.
+    if (response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()):
+        return response
+    data = response.get_data()
+    if len(data) < _COMPRESS_MIN_SIZE:
+        return response
+    response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Content-Length'] = len(response.get_data())
+    response.headers.add('Vary', 'Accept-Encoding')
+    return response
+
 @app.route('/upload', methods=['POST'])
 def upload_project():
     if 'file' not in request.files:
@@ -24,27 +62,32 @@ def upload_project():
     temp_dir = tempfile.mkdtemp()
     try:
         file_path = os.path.join(temp_dir, filename)
-        file.save(file_path)
+        # Stream the upload to disk in 1 MiB chunks instead of werkzeug's
+        # default 16 KiB, keeping memory flat for large project zips.
+        file.save(file_path, buffer_size=1024 * 1024)
         
-        # Extract the uploaded zip file
-        with zipfile.ZipFile(file_path, 'r') as zip_ref:
-            zip_ref.extractall(temp_dir)
+        # Extract the uploaded zip file (streamed entry-by-entry)
+        extract_zip(file_path, temp_dir)
         
         # Process the Python files in the extracted directory
         python_files = get_python_files(temp_dir)
         all_imports, all_functions = analyze_files(python_files)
         G = create_dependency_graph(all_imports, all_functions)
-        
-        output_path = os.path.join('graph', 'project_structure.png')
+
+        # uuid4-based names keep concurrent requests from clobbering each
+        # other's graph files
+        graph_name = f"dependency_graph_{uuid4().hex}.png"
+        output_path = os.path.join(app.config['UPLOAD_FOLDER'], graph_name)
         save_graph(G, output_path)
-        
+
         # Generate summary
         summary = generate_summary(all_imports, all_functions, temp_dir)
-        
+
         return jsonify({
             'status': 'success',
-            'message': 'Project analyzed successfully. Graph saved in the graph directory.',
+            'message': 'Project analyzed successfully.',
             'graph_path': os.path.abspath(output_path),
+            'graph_name': graph_name,
             'summary': summary
         })
     except Exception as e:
@@ -61,33 +104,38 @@ def github_project():
     if not github_url:
         return jsonify({'status': 'error', 'message': 'GitHub URL is required'}), 400
 
+    temp_dir = None
     try:
         temp_dir = clone_github_repo(github_url)
         python_files = get_python_files(temp_dir)
         all_imports, all_functions = analyze_files(python_files)
         G = create_dependency_graph(all_imports, all_functions)
-        
-        output_path = os.path.join('graph', 'project_structure.png')
+
+        graph_name = f"dependency_graph_{uuid4().hex}.png"
+        output_path = os.path.join(app.config['UPLOAD_FOLDER'], graph_name)
         save_graph(G, output_path)
-        
+
         summary = generate_summary_github(all_imports, all_functions, github_url, temp_dir)
-        
+
         return jsonify({
             'status': 'success',
-            'message': 'Project analyzed successfully. Graph saved in the graph directory.',
+            'message': 'Project analyzed successfully.',
             'graph_path': os.path.abspath(output_path),
+            'graph_name': graph_name,
             'summary': summary
         })
     except Exception as e:
         traceback.print_exc()
         return jsonify({'status': 'error', 'message': str(e)}), 500
     finally:
-        cleanup_temp_dir(temp_dir)
+        if temp_dir is not None:
+            cleanup_temp_dir(temp_dir)
 
 
 @app.route('/graph', methods=['GET'])
 def get_graph():
-    graph_path = os.path.join(tempfile.gettempdir(), 'dependency_graph.png')
+    graph_name = secure_filename(request.args.get('name', 'dependency_graph.png'))
+    graph_path = os.path.join(app.config['UPLOAD_FOLDER'], graph_name)
     return send_file(graph_path, mimetype='image/png')
 
 if __name__ == '__main__':